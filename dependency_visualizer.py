@@ -1,26 +1,123 @@
 #!/usr/bin/env python3
+import array
+import asyncio
 import configparser
+import functools
+import importlib.util
+import io
 import os
+import subprocess
 import sys
+import httpx
+import ijson
 import requests
-import json
-from collections import defaultdict
-import graphviz
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1.
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+HTTP_HEADERS = {
+    'User-Agent': 'dep-visualizer/1.0',
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip'
+}
+
+# Retry and timeout policy shared by the sync session and the async client.
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+@dataclass(slots=True, frozen=True)
+class Dep:
+    name: str
+    version: str
+    kind: str
+
+# Read buffer for config and test files; CPython's 8 KiB default is too small.
+READ_BUFFER_SIZE = 1 << 18
+
+# Test files above this size are streamed with ijson instead of loaded whole.
+TEST_STREAM_THRESHOLD = 16 * 1024 * 1024
+
+# Parsed load_config params keyed by (config_file, st_mtime_ns).
+_CONFIG_CACHE = {}
+
+# DFS vertex colours: unseen, on the current path, fully explored.
+WHITE, GRAY, BLACK = 0, 1, 2
 
 class DependencyVisualizer:
-    def __init__(self, config_file="config.ini"):
+    _VERSION_STRIP = str.maketrans('', '', '^~=')
+    _URL_TMPL = "https://crates.io/api/v1/crates/{p}/{v}/dependencies"
+    
+    def __init__(self, config_file="config.ini", session=None):
         self.config_file = config_file
         self.params = {}
-        self.graph = defaultdict(list)
+        self._filter_sub = ''
+        # Graph as structure-of-arrays: (package, version) pairs are interned
+        # to integer ids and edges are kept as parallel unsigned-int arrays
+        # (4 bytes per id instead of a PyObject pointer plus int object).
+        self._intern = {}
+        self._nodes = []
+        self._edges_src = array.array('I')
+        self._edges_dst = array.array('I')
+        self._load_order = []
         self.visited = set()
         self.cycles = []
+        self._dep_cache = {}
+        
+        self._session = session if session is not None else self._new_session()
+        
+    @staticmethod
+    def _new_session():
+        # One pooled session for every sync fetch so HTTPS connections are
+        # kept alive instead of re-handshaking per package.
+        retry = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF,
+                      status_forcelist=RETRY_STATUSES)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.headers.update(HTTP_HEADERS)
+        return session
         
     def load_config(self):
         if not os.path.exists(self.config_file):
             raise FileNotFoundError(f"Config file {self.config_file} not found")
             
+        # Only the INI read/parse is skipped for an unchanged file; the params
+        # are still printed and validated the same way on every load.
+        cache_key = (self.config_file, os.stat(self.config_file).st_mtime_ns)
+        if cache_key in _CONFIG_CACHE:
+            self.params = dict(_CONFIG_CACHE[cache_key])
+        else:
+            self._read_config()
+            
+        print("=== Configuration Parameters ===")
+        for key, value in self.params.items():
+            print(f"{key}: {value}")
+        print("=================================")
+        
+        if not self.params['package_name']:
+            raise ValueError("package_name is required")
+        if not self.params['version']:
+            raise ValueError("version is required")
+            
+        self._filter_sub = self.params['filter_substring'].lower()
+        _CONFIG_CACHE[cache_key] = dict(self.params)
+
+    def _read_config(self):
+        with open(self.config_file, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            config_text = f.read().decode('utf-8')
+            
         config = configparser.ConfigParser()
-        config.read(self.config_file)
+        config.read_string(config_text, source=self.config_file)
         
         expected_params = {
             'package_name': '',
@@ -47,43 +144,99 @@ class DependencyVisualizer:
         except ValueError:
             print("Error: max_depth must be an integer")
             sys.exit(1)
-        
-        print("=== Configuration Parameters ===")
-        for key, value in self.params.items():
-            print(f"{key}: {value}")
-        print("=================================")
-        
-        if not self.params['package_name']:
-            raise ValueError("package_name is required")
-        if not self.params['version']:
-            raise ValueError("version is required")
 
     def fetch_dependencies(self, package, version):
-        url = f"https://crates.io/api/v1/crates/{package}/{version}/dependencies"
+        key = (package, version)
+        hit = self._dep_cache.get(key)
+        if hit is not None:
+            return hit
+            
+        url = self._dependencies_url(package, version)
         
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            response = self._session.get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching dependencies: {e}")
+            dependencies = None
+        else:
+            dependencies = self._dependencies_from_response(
+                response.status_code, response.content, url
+            )
             
-            data = response.json()
-            dependencies = []
+        # Only definitive answers (404s and parsed or unparseable bodies) are
+        # cached; transient failures stay uncached so a later lookup retries.
+        if dependencies is None:
+            return []
             
-            for dep in data.get('dependencies', []):
-                dep_info = {
-                    'name': dep['crate_id'],
-                    'version': dep['req'],
-                    'kind': dep.get('kind', 'normal')
-                }
-                dependencies.append(dep_info)
+        self._dep_cache[key] = dependencies
+        return dependencies
+
+    async def _fetch_deps_async(self, client, package, version):
+        key = (package, version)
+        hit = self._dep_cache.get(key)
+        if hit is not None:
+            return hit
+            
+        url = self._dependencies_url(package, version)
+        
+        dependencies = None
+        for attempt in range(RETRY_TOTAL + 1):
+            if attempt:
+                # Exponential backoff, mirroring the sync session's Retry.
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
                 
-            return dependencies
+            try:
+                response = await client.get(url)
+            except httpx.TransportError as e:
+                error = e
+                continue
+            except httpx.HTTPError as e:
+                print(f"Error fetching dependencies: {e}")
+                break
+                
+            if response.status_code in RETRY_STATUSES:
+                error = f"HTTP {response.status_code} for url: {url}"
+                continue
+                
+            dependencies = self._dependencies_from_response(
+                response.status_code, response.content, url
+            )
+            break
+        else:
+            print(f"Error fetching dependencies: {error}")
             
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching dependencies: {e}")
+        if dependencies is None:
             return []
-        except json.JSONDecodeError as e:
+            
+        self._dep_cache[key] = dependencies
+        return dependencies
+
+    def _dependencies_url(self, package, version):
+        return self._URL_TMPL.format(p=quote(package, safe=''), v=quote(version, safe=''))
+
+    def _dependencies_from_response(self, status_code, content, url):
+        # Crates missing from the registry are common, so a 404 is answered
+        # without building an HTTPError via raise_for_status(). Other error
+        # statuses return None: there is no answer worth caching.
+        if status_code == 404:
+            return []
+        if status_code >= 400:
+            print(f"Error fetching dependencies: HTTP {status_code} for url: {url}")
+            return None
+            
+        try:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing JSON response: {e}")
             return []
+            
+        return self._parse_dependencies(data)
+
+    def _parse_dependencies(self, data):
+        return [
+            Dep(sys.intern(d['crate_id']), sys.intern(d['req']), sys.intern(d.get('kind', 'normal')))
+            for d in data.get('dependencies', ())
+        ]
 
     def print_direct_dependencies(self):
         package = self.params['package_name']
@@ -97,11 +250,12 @@ class DependencyVisualizer:
             print("No dependencies found or error occurred")
             return
             
-        print(f"\n=== Direct Dependencies for {package} v{version} ===")
+        lines = [f"\n=== Direct Dependencies for {package} v{version} ==="]
         for i, dep in enumerate(dependencies, 1):
-            kind = f" ({dep['kind']})" if dep['kind'] != 'normal' else ''
-            print(f"{i}. {dep['name']} {dep['version']}{kind}")
-        print("=============================================")
+            kind = f" ({dep.kind})" if dep.kind != 'normal' else ''
+            lines.append(f"{i}. {dep.name} {dep.version}{kind}")
+        lines.append("=============================================")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def build_dependency_graph(self):
         if self.params['test_mode']:
@@ -110,104 +264,158 @@ class DependencyVisualizer:
             
         package = self.params['package_name']
         version = self.params['version']
-        self._bfs_with_recursion(package, version, 0)
+        asyncio.run(self._build_async())
+        self._traverse(package, version)
         
         self._print_graph()
         
         if self.cycles:
             print(f"\nCyclic dependencies detected: {self.cycles}")
 
-    def _bfs_with_recursion(self, package, version, current_depth):
-        if current_depth > self.params['max_depth']:
-            return
-            
-        if (package, version) in self.visited:
-            self.cycles.append((package, version))
-            return
-            
-        self.visited.add((package, version))
+    @staticmethod
+    def _async_client(max_connections=32):
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_connections)
+        # No pool timeout: a wide frontier queues for a free connection
+        # instead of failing with PoolTimeout while waiting for one.
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=None)
+        return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout,
+                                 headers=HTTP_HEADERS)
+
+    async def _build_async(self):
+        async with self._async_client() as client:
+            await self._bfs(client)
+
+    async def _bfs(self, client):
+        # Level-synchronous BFS: every package on the current depth level is
+        # fetched concurrently, so wall time grows with depth, not node count.
+        root = (self.params['package_name'], self.params['version'])
+        frontier = [] if self._is_filtered(root[0]) else [root]
+        depth = 0
         
-        filter_sub = self.params['filter_substring'].lower()
-        if filter_sub and filter_sub in package.lower():
-            return
+        while frontier and depth <= self.params['max_depth']:
+            expand = []
+            for package, version in frontier:
+                if (package, version) in self.visited:
+                    continue
+                    
+                self.visited.add((package, version))
+                expand.append((package, version))
+                
+            results = await asyncio.gather(
+                *[self._fetch_deps_async(client, p, v) for p, v in expand]
+            )
             
-        dependencies = self.fetch_dependencies(package, version)
+            frontier = []
+            for (package, version), dependencies in zip(expand, results):
+                for dep in dependencies:
+                    # Filtered packages never become nodes, so their
+                    # subtrees are neither fetched nor rendered.
+                    if self._is_filtered(dep.name):
+                        continue
+                        
+                    dep_name = dep.name
+                    dep_version = self._extract_version(dep.version)
+                    
+                    self._edges_src.append(self._nid(package, version))
+                    self._edges_dst.append(self._nid(dep_name, dep_version))
+                    frontier.append((dep_name, dep_version))
+                    
+            depth += 1
+
+    def _is_filtered(self, package):
+        return bool(self._filter_sub) and self._filter_sub in package.lower()
+
+    def _nid(self, package, version):
+        key = (package, version)
+        nid = self._intern.get(key)
+        if nid is None:
+            nid = self._intern[key] = len(self._nodes)
+            self._nodes.append(key)
+        return nid
+
+    def _node_label(self, nid):
+        package, version = self._nodes[nid]
+        return f"{package}@{version}"
+
+    def _adjacency(self):
+        children = [[] for _ in self._nodes]
+        for src, dst in zip(self._edges_src, self._edges_dst):
+            children[src].append(dst)
+        return children
+
+    def _traverse(self, root_pkg, root_ver):
+        # Single iterative DFS over the fetched graph that yields both results:
+        # reaching a GRAY node is a back edge, i.e. a real cycle rather than a
+        # package shared by two parents, and nodes are appended to the load
+        # order as they turn BLACK, after everything they depend on.
+        root = self._nid(root_pkg, root_ver)
+        adjacency = self._adjacency()
+        color = [WHITE] * len(self._nodes)
+        color[root] = GRAY
+        stack = [(root, iter(adjacency[root]))]
         
-        for dep in dependencies:
-            dep_name = dep['name']
-            dep_version = self._extract_version(dep['version'])
-            
-            self.graph[f"{package}@{version}"].append(f"{dep_name}@{dep_version}")
-            
-            self._bfs_with_recursion(dep_name, dep_version, current_depth + 1)
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                state = color[child]
+                if state == WHITE:
+                    color[child] = GRAY
+                    stack.append((child, iter(adjacency[child])))
+                    break
+                if state == GRAY:
+                    self.cycles.append(self._node_label(child))
+            else:
+                color[node] = BLACK
+                stack.pop()
+                self._load_order.append(node)
 
-    def _extract_version(self, version_req):
-        clean_version = version_req.replace('^', '').replace('~', '').replace('=', '')
-        return clean_version.split(',')[0] if ',' in clean_version else clean_version
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _extract_version(version_req):
+        return version_req.translate(DependencyVisualizer._VERSION_STRIP).partition(',')[0]
 
     def _test_mode_analysis(self):
         test_file = self.params['test_repo_path']
         try:
-            with open(test_file, 'r') as f:
-                test_data = json.load(f)
+            with open(test_file, 'rb', buffering=READ_BUFFER_SIZE) as f:
+                if os.path.getsize(test_file) > TEST_STREAM_THRESHOLD:
+                    items = ijson.kvitems(f, '', buf_size=READ_BUFFER_SIZE)
+                else:
+                    items = orjson.loads(f.read()).items()
+                    
+                print(f"\n=== Test Mode Analysis from {test_file} ===")
+                for package, deps in items:
+                    print(f"{package} -> {deps}")
+                print("===========================================")
                 
-            print(f"\n=== Test Mode Analysis from {test_file} ===")
-            for package, deps in test_data.items():
-                print(f"{package} -> {deps}")
-            print("===========================================")
-            
         except FileNotFoundError:
             print(f"Test file {test_file} not found")
-        except json.JSONDecodeError:
+        except (orjson.JSONDecodeError, ijson.JSONError):
             print(f"Invalid JSON in test file {test_file}")
 
     def _print_graph(self):
-        print("\n=== Dependency Graph ===")
-        for package, dependencies in self.graph.items():
-            if dependencies:
-                print(f"{package} -> {', '.join(dependencies)}")
-            else:
-                print(f"{package} -> No dependencies")
-        print("========================")
+        lines = ["\n=== Dependency Graph ==="]
+        edges = zip(self._edges_src, self._edges_dst)
+        for src, group in groupby(edges, key=lambda edge: edge[0]):
+            dependencies = [self._node_label(dst) for _, dst in group]
+            lines.append(f"{self._node_label(src)} -> {', '.join(dependencies)}")
+        lines.append("========================")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def analyze_dependencies(self):
         if self.params['test_mode']:
             return
             
-        load_order = self._calculate_load_order()
+        load_order = [self._node_label(nid) for nid in self._load_order]
         self._print_load_order(load_order)
         self._compare_with_cargo(load_order)
 
-    def _calculate_load_order(self):
-        visited = set()
-        load_order = []
-        
-        def dfs(package, version):
-            node = f"{package}@{version}"
-            if node in visited:
-                return
-                
-            visited.add(node)
-            
-            dependencies = self.fetch_dependencies(package, version)
-            
-            for dep in dependencies:
-                dep_name = dep['name']
-                dep_version = self._extract_version(dep['version'])
-                dfs(dep_name, dep_version)
-                
-            load_order.append(node)
-            
-        package = self.params['package_name']
-        version = self.params['version']
-        dfs(package, version)
-        
-        return load_order[::-1]
-
     def _print_load_order(self, load_order):
-        print("\n=== Dependency Load Order ===")
+        lines = ["\n=== Dependency Load Order ==="]
         for i, package in enumerate(load_order, 1):
-            print(f"{i}. {package}")
+            lines.append(f"{i}. {package}")
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     def _compare_with_cargo(self, load_order):
         print("\n=== Comparison with Cargo ===")
@@ -224,7 +432,7 @@ class DependencyVisualizer:
         print("  4. Build vs normal dependencies")
 
     def visualize_graph(self):
-        if not self.graph:
+        if not self._edges_src:
             print("No graph data to visualize")
             return
             
@@ -232,38 +440,44 @@ class DependencyVisualizer:
         print("\n=== Graphviz Text Representation ===")
         print(graphviz_text)
         
-        self._create_visualization()
-        self._demonstrate_examples()
+        renders = [(graphviz_text, self.params['output_file'])]
+        renders.extend(self._demonstrate_examples())
+        self._create_visualization(renders)
         self._compare_with_cargo_visualization()
 
     def _generate_graphviz_text(self):
-        dot_lines = ["digraph Dependencies {"]
-        dot_lines.append("  rankdir=LR;")
-        dot_lines.append("  node [shape=box, style=filled, fillcolor=lightblue];")
-        
-        for package, dependencies in self.graph.items():
-            for dep in dependencies:
-                dot_lines.append(f'  "{package}" -> "{dep}";')
-                
-        dot_lines.append("}")
-        return "\n".join(dot_lines)
+        label = self._node_label
+        body = "\n".join(
+            f'  "{label(src)}" -> "{label(dst)}";'
+            for src, dst in zip(self._edges_src, self._edges_dst)
+        )
+        return (
+            "digraph Dependencies {\n"
+            "  rankdir=LR;\n"
+            "  node [shape=box, style=filled, fillcolor=lightblue];\n"
+            f"{body}\n"
+            "}"
+        )
 
-    def _create_visualization(self):
-        try:
-            dot = graphviz.Digraph(comment='Dependency Graph')
-            dot.attr(rankdir='LR')
-            dot.attr('node', shape='box', style='filled', fillcolor='lightblue')
+    def _create_visualization(self, renders):
+        # Feed each DOT text straight to its own dot process. The renders are
+        # independent and the threads only wait on subprocesses, so they run
+        # side by side without contending for the GIL.
+        def render(job):
+            dot_text, output_file = job
+            subprocess.run(['dot', '-Tpng', '-o', output_file], input=dot_text,
+                           text=True, check=True)
             
-            for package, dependencies in self.graph.items():
-                for dep in dependencies:
-                    dot.edge(package, dep)
-                    
-            output_file = self.params['output_file']
-            dot.render(output_file.replace('.png', ''), format='png', cleanup=True)
-            print(f"\nGraph saved as {output_file}")
+        workers = min(len(renders), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(render, job) for job in renders]
             
-        except Exception as e:
-            print(f"Error creating visualization: {e}")
+        for (_, output_file), future in zip(renders, futures):
+            try:
+                future.result()
+                print(f"\nGraph saved as {output_file}")
+            except Exception as e:
+                print(f"\nError creating visualization for {output_file}: {e}")
 
     def _demonstrate_examples(self):
         demo_packages = [
@@ -271,10 +485,37 @@ class DependencyVisualizer:
             ("tokio", "1.0.0"), 
             ("reqwest", "0.11.0")
         ]
+        stem, ext = os.path.splitext(self.params['output_file'])
+        renders = []
+        
+        examples = [self._example_visualizer(package, version) for package, version in demo_packages]
+        asyncio.run(self._build_examples_async(examples))
         
         print("\n=== Visualization Examples for Three Packages ===")
-        for package, version in demo_packages:
-            print(f"Example visualization available for: {package} v{version}")
+        for (package, version), example in zip(demo_packages, examples):
+            if not example._edges_src:
+                print(f"No graph data to visualize for {package} v{version}")
+                continue
+                
+            output_file = f"{stem}_{package}{ext}"
+            renders.append((example._generate_graphviz_text(), output_file))
+            print(f"Rendering example for {package} v{version} to {output_file}")
+            
+        return renders
+
+    def _example_visualizer(self, package, version):
+        # Same settings, fetch cache and HTTP session, different root package.
+        example = DependencyVisualizer(self.config_file, session=self._session)
+        example.params = dict(self.params, package_name=package, version=version)
+        example._filter_sub = self._filter_sub
+        example._dep_cache = self._dep_cache
+        return example
+
+    async def _build_examples_async(self, examples):
+        # All example graphs fetch side by side over one client whose pool is
+        # sized so each example gets the connections a single build would.
+        async with self._async_client(max_connections=32 * len(examples)) as client:
+            await asyncio.gather(*(example._bfs(client) for example in examples))
 
     def _compare_with_cargo_visualization(self):
         print("\n=== Comparison with Cargo Visualization ===")
@@ -286,21 +527,50 @@ class DependencyVisualizer:
         print("  3. Feature-based dependency resolution")
         print("  4. Version conflict resolution strategies")
 
-def main():
-    visualizer = DependencyVisualizer()
-    
+def _buffered_stdout():
+    # Block-buffer stdout with a 256 KiB buffer. Streams without a real file
+    # descriptor (redirect_stdout, pytest capture, notebooks) are left as is.
     try:
-        visualizer.load_config()
-        visualizer.print_direct_dependencies()
-        visualizer.build_dependency_graph()
-        visualizer.analyze_dependencies()
-        visualizer.visualize_graph()
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
         
-        print("\n=== Analysis completed successfully! ===")
+    sys.stdout.flush()
+    raw = io.FileIO(fd, 'w', closefd=False)
+    return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=262144), encoding='utf-8',
+                            newline='\n', line_buffering=False, write_through=False)
+
+def main():
+    previous_stdout = sys.stdout
+    buffered_stdout = _buffered_stdout()
+    if buffered_stdout is not None:
+        sys.stdout = buffered_stdout
         
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+    try:
+        visualizer = DependencyVisualizer()
+        
+        try:
+            visualizer.load_config()
+            params = visualizer.params
+            if not params['test_mode'] and visualizer._is_filtered(params['package_name']):
+                print("Root package filtered; nothing to do")
+                return
+                
+            visualizer.print_direct_dependencies()
+            visualizer.build_dependency_graph()
+            visualizer.analyze_dependencies()
+            visualizer.visualize_graph()
+            
+            print("\n=== Analysis completed successfully! ===")
+            
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+            
+    finally:
+        if buffered_stdout is not None:
+            buffered_stdout.flush()
+            sys.stdout = previous_stdout
 
 if __name__ == "__main__":
     main()
\ No newline at end of file